@@ -5,50 +5,455 @@ Script pour résoudre les adresses IP des sites web
 Lit une liste de sites depuis un fichier txt et génère un JSON avec les IPs
 """
 
+import asyncio
+import re
 import socket
 import json
+import os
 import sys
 import argparse
+import sqlite3
 import subprocess
 import datetime
-from typing import Dict, List, Optional
+import functools
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    import aiodns
+    _DNS_ERRORS = (socket.gaierror, aiodns.error.DNSError)
+except ImportError:  # aiodns est optionnel, repli sur loop.getaddrinfo
+    aiodns = None
+    _DNS_ERRORS = (socket.gaierror,)
 
-def resolve_domain_ips(domain: str) -> List[str]:
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, repli sur le module json standard
+    orjson = None
+
+# Journal de progression (désactivé avec --quiet)
+log = logging.getLogger(__name__)
+
+# Nombre maximum de résolutions DNS simultanées
+MAX_WORKERS = 64
+
+# Nombre maximum de requêtes DNS en vol en mode asynchrone
+MAX_ASYNC_QUERIES = 500
+
+# Traitements CPU appliqués à chaque (domaine, IPs) après la résolution
+# (validation, géolocalisation, agrégation CIDR...). Ils sont envoyés à un pool
+# de processus et doivent donc être des fonctions définies au niveau d'un module.
+POST_PROCESSORS: List[Callable[[str, List[str]], List[str]]] = []
+
+# Nombre de paires envoyées à la fois à chaque processus de post-traitement
+POST_PROCESS_CHUNKSIZE = 128
+
+# Délai maximal d'une résolution DNS asynchrone, en secondes
+DEFAULT_TIMEOUT = 5.0
+
+# Cache DNS persistant entre les exécutions et sa durée de validité (secondes)
+DEFAULT_CACHE_FILE = '.dns_cache.db'
+DEFAULT_CACHE_TTL = 900.0
+
+# Taille du tampon d'écriture des fichiers de sortie
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Taille des blocs lus dans le fichier d'entrée
+READ_CHUNK_SIZE = 1 << 16
+
+# Schéma http(s) et www optionnels, puis le nom d'hôte jusqu'au chemin/requête/fragment
+_URL_RE = re.compile(r'^(?:https?://)?(?:www\.)?([^/?#]+)')
+
+
+def _clean(domain: str) -> str:
+    """
+    Nettoie un domaine (enlève http/https, www et le chemin éventuel)
+    
+    Args:
+        domain (str): Le domaine ou l'URL à nettoyer
+        
+    Returns:
+        str: Le nom d'hôte seul
+    """
+    domain = domain.strip()
+    match = _URL_RE.match(domain)
+    return match.group(1) if match else domain
+
+
+class _Cache:
+    """
+    Cache DNS sur disque (sqlite3) avec durée de validité
+    
+    Partagé entre les threads de résolution, les accès sont protégés par un verrou.
+    Les nouvelles entrées sont gardées en mémoire et écrites en une seule
+    transaction à la fermeture, pour ne pas verrouiller la base pendant la
+    résolution. Le cache n'est qu'une optimisation : une erreur sqlite (base
+    verrouillée par une autre exécution, fichier corrompu...) est signalée puis
+    ignorée, sans attente, et le domaine est résolu normalement.
+    """
+    
+    def __init__(self, path: str, ttl: float):
+        """
+        Args:
+            path (str): Chemin de la base sqlite
+            ttl (float): Durée de validité d'une entrée en secondes
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        # Pas d'attente sur une base verrouillée : c'est un simple défaut de cache
+        self._conn = sqlite3.connect(path, timeout=0, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS dns_cache '
+            '(domain TEXT PRIMARY KEY, ips TEXT, ts REAL)'
+        )
+    
+    def get(self, clean_domain: str) -> Optional[List[str]]:
+        """
+        Args:
+            clean_domain (str): Le nom d'hôte nettoyé
+            
+        Returns:
+            Optional[List[str]]: Les IPs en cache, ou None si absentes, expirées ou inaccessibles
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT ips, ts FROM dns_cache WHERE domain = ?', (clean_domain,)
+                ).fetchone()
+            if row is None or time.time() - row[1] >= self.ttl:
+                return None
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Cache DNS indisponible pour {clean_domain}, résolution directe: {e}")
+            return None
+    
+    def set(self, clean_domain: str, ips: List[str]):
+        """
+        Args:
+            clean_domain (str): Le nom d'hôte nettoyé
+            ips (List[str]): Les IPs résolues, écrites dans la base par close()
+        """
+        with self._lock:
+            self._pending[clean_domain] = (json.dumps(ips), time.time())
+    
+    def close(self):
+        """Enregistre les nouvelles entrées en une seule transaction et ferme la base"""
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO dns_cache (domain, ips, ts) VALUES (?, ?, ?)',
+                        ((domain, ips, ts) for domain, (ips, ts) in self._pending.items())
+                    )
+            except sqlite3.Error as e:
+                print(f"Impossible d'enregistrer le cache DNS: {e}")
+            finally:
+                self._pending.clear()
+                self._conn.close()
+
+
+def _dumps(obj) -> bytes:
+    """
+    Sérialise un objet en JSON indenté, encodé en UTF-8
+    
+    Utilise orjson s'il est installé, sinon le module json standard.
+    
+    Args:
+        obj: L'objet à sérialiser
+        
+    Returns:
+        bytes: Le document JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _ip_literal(clean_domain: str) -> Optional[str]:
+    """
+    Reconnaît un nom d'hôte qui est déjà une adresse IPv4 ou IPv6
+    
+    Args:
+        clean_domain (str): Le nom d'hôte nettoyé
+        
+    Returns:
+        Optional[str]: L'adresse sous forme canonique (comme getaddrinfo la renverrait),
+        ou None si une résolution est nécessaire
+    """
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            return socket.inet_ntop(family, socket.inet_pton(family, clean_domain))
+        except OSError:
+            pass
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_clean(clean_domain: str) -> Tuple[str, ...]:
+    """
+    Résout un nom d'hôte déjà nettoyé (résultat mis en cache)
+    
+    Args:
+        clean_domain (str): Le nom d'hôte nettoyé
+        
+    Returns:
+        Tuple[str, ...]: Adresses IP uniques, dans l'ordre renvoyé par le résolveur
+    """
+    seen = set()
+    ips = []
+    # Une seule entrée par adresse (sans doublons UDP/RAW)
+    result = socket.getaddrinfo(clean_domain, None, socket.AF_UNSPEC,
+                                socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    for addr_info in result:
+        ip = addr_info[4][0]
+        if ip not in seen:
+            seen.add(ip)
+            ips.append(ip)
+    return tuple(ips)
+
+
+def resolve_domain_ips(domain: str, cache: Optional[_Cache] = None) -> List[str]:
     """
     Résout toutes les adresses IP d'un domaine
     
+    Les variantes d'un même hôte (http://, www., chemin) ne sont résolues qu'une fois.
+    
     Args:
         domain (str): Le nom de domaine à résoudre
+        cache (Optional[_Cache]): Cache DNS persistant à consulter et compléter
         
     Returns:
         List[str]: Liste des adresses IP trouvées
     """
-    ips = []
     try:
-        # Nettoyer le domaine (enlever http/https et www si présent)
-        clean_domain = domain.strip()
-        if clean_domain.startswith(('http://', 'https://')):
-            clean_domain = clean_domain.split('://', 1)[1]
-        if clean_domain.startswith('www.'):
-            clean_domain = clean_domain[4:]
-        
-        # Enlever le chemin s'il y en a un
-        clean_domain = clean_domain.split('/')[0]
-        
-        # Résoudre les adresses IP
-        result = socket.getaddrinfo(clean_domain, None)
-        for addr_info in result:
-            ip = addr_info[4][0]
-            if ip not in ips:
-                ips.append(ip)
-                
+        clean_domain = _clean(domain)
+        # Adresse IP littérale : ni résolution ni cache
+        literal = _ip_literal(clean_domain)
+        if literal is not None:
+            return [literal]
+        
+        if cache is not None:
+            cached = cache.get(clean_domain)
+            if cached is not None:
+                return cached
+        
+        ips = list(_resolve_clean(clean_domain))
+        if cache is not None and ips:
+            cache.set(clean_domain, ips)
+        return ips
     except socket.gaierror as e:
         print(f"Erreur lors de la résolution de {domain}: {e}")
     except Exception as e:
         print(f"Erreur inattendue pour {domain}: {e}")
     
-    return ips
+    return []
+
+
+def resolve_threaded(domains: List[str], cache: Optional[_Cache] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Résout les domaines en parallèle dans un pool de threads
+    
+    Les résolutions sont des I/O réseau, les threads ne sont pas bloqués par le GIL.
+    
+    Args:
+        domains (List[str]): Liste des domaines à résoudre
+        cache (Optional[_Cache]): Cache DNS persistant à consulter et compléter
+        
+    Yields:
+        Tuple[str, List[str]]: Paires (domaine, liste d'IPs) dans l'ordre de fin de résolution
+    """
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(domains))) as executor:
+        futures = {executor.submit(resolve_domain_ips, domain, cache): domain for domain in domains}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+async def resolve_all(domains: List[str], timeout: float = DEFAULT_TIMEOUT,
+                      cache: Optional[_Cache] = None) -> AsyncIterator[Tuple[str, List[str]]]:
+    """
+    Résout tous les domaines de façon asynchrone sur une seule boucle d'événements
+    
+    Utilise aiodns (c-ares) s'il est installé, sinon loop.getaddrinfo.
+    
+    Args:
+        domains (List[str]): Liste des domaines à résoudre
+        timeout (float): Durée maximale d'une résolution en secondes
+        cache (Optional[_Cache]): Cache DNS persistant à consulter et compléter
+        
+    Yields:
+        Tuple[str, List[str]]: Paires (domaine, liste d'IPs) dans l'ordre de fin de résolution
+    """
+    loop = asyncio.get_running_loop()
+    resolver = aiodns.DNSResolver(timeout=timeout) if aiodns is not None else None
+    # Limiter les requêtes simultanées pour ne pas épuiser les descripteurs de fichiers
+    sem = asyncio.Semaphore(MAX_ASYNC_QUERIES)
+    
+    async def lookup(clean_domain: str) -> List[str]:
+        if resolver is not None:
+            result = await resolver.getaddrinfo(clean_domain, family=socket.AF_UNSPEC,
+                                                type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP)
+            # pycares 5 renvoie les adresses en bytes
+            addresses = (node.addr[0] for node in result.nodes)
+            return list(dict.fromkeys(
+                addr.decode('ascii') if isinstance(addr, bytes) else addr for addr in addresses
+            ))
+        result = await loop.getaddrinfo(clean_domain, None, family=socket.AF_UNSPEC,
+                                        type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP)
+        return list(dict.fromkeys(addr_info[4][0] for addr_info in result))
+    
+    async def one(domain: str) -> Tuple[str, List[str]]:
+        clean_domain = _clean(domain)
+        # Adresse IP littérale : ni résolution ni cache
+        literal = _ip_literal(clean_domain)
+        if literal is not None:
+            return domain, [literal]
+        
+        if cache is not None:
+            cached = cache.get(clean_domain)
+            if cached is not None:
+                return domain, cached
+        
+        async with sem:
+            try:
+                ips = await asyncio.wait_for(lookup(clean_domain), timeout)
+                if cache is not None and ips:
+                    cache.set(clean_domain, ips)
+                return domain, ips
+            except asyncio.TimeoutError:
+                print(f"Délai dépassé pour {domain} ({timeout:g} s)")
+            except _DNS_ERRORS as e:
+                print(f"Erreur lors de la résolution de {domain}: {e}")
+            except Exception as e:
+                print(f"Erreur inattendue pour {domain}: {e}")
+            return domain, []
+    
+    tasks = [asyncio.ensure_future(one(domain)) for domain in domains]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Arrêt anticipé du consommateur : ne pas laisser de résolutions orphelines
+        for task in tasks:
+            task.cancel()
+
+
+def resolve_async(domains: List[str], timeout: float = DEFAULT_TIMEOUT,
+                  cache: Optional[_Cache] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Version synchrone de resolve_all, pour afficher la progression au fil de l'eau
+    
+    La boucle d'événements ne tourne que le temps d'obtenir chaque résultat.
+    
+    Args:
+        domains (List[str]): Liste des domaines à résoudre
+        timeout (float): Durée maximale d'une résolution en secondes
+        cache (Optional[_Cache]): Cache DNS persistant à consulter et compléter
+        
+    Yields:
+        Tuple[str, List[str]]: Paires (domaine, liste d'IPs) dans l'ordre de fin de résolution
+    """
+    loop = asyncio.new_event_loop()
+    results = resolve_all(domains, timeout, cache)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
+def iter_domains(file_path: str) -> Iterator[str]:
+    """
+    Parcourt les domaines d'un fichier txt par blocs, sans le charger en entier
+    
+    Args:
+        file_path (str): Chemin vers le fichier contenant les domaines
+        
+    Yields:
+        str: Chaque domaine, sans blancs en début et fin
+    """
+    buffer = ''
+    with open(file_path, 'r', encoding='utf-8') as file:
+        while True:
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            # Séparer par les virgules, le dernier morceau pouvant être coupé en fin de bloc
+            *tokens, buffer = (buffer + chunk).split(',')
+            for token in tokens:
+                # Nettoyer les espaces aux extrémités seulement
+                token = token.strip()
+                if token:
+                    yield token
+    buffer = buffer.strip()
+    if buffer:
+        yield buffer
+
+
+def _post_process(item: Tuple[str, List[str]],
+                  processors: Tuple[Callable[[str, List[str]], List[str]], ...]) -> Tuple[str, List[str]]:
+    """
+    Applique les traitements à un domaine résolu (exécuté dans un processus fils)
+    
+    Args:
+        item (Tuple[str, List[str]]): Paire (domaine, liste d'IPs)
+        processors (Tuple[Callable, ...]): Traitements transmis par le processus parent
+        
+    Returns:
+        Tuple[str, List[str]]: Paire (domaine, liste d'IPs traitée)
+    """
+    domain, ips = item
+    for processor in processors:
+        ips = processor(domain, ips)
+    return domain, ips
+
+
+def post_process(resolved: Iterable[Tuple[str, List[str]]]) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Applique les traitements CPU post-résolution dans un pool de processus
+    
+    Contrairement à la résolution (I/O), ces traitements sont limités par le GIL,
+    d'où des processus plutôt que des threads. Sans POST_PROCESSORS, les paires
+    sont transmises telles quelles, sans démarrer de processus.
+    
+    Les paires sont traitées par lots de POST_PROCESS_CHUNKSIZE par processus :
+    la progression s'affiche donc lot par lot et non plus domaine par domaine.
+    
+    Args:
+        resolved (Iterable[Tuple[str, List[str]]]): Paires (domaine, liste d'IPs)
+        
+    Yields:
+        Tuple[str, List[str]]: Paires (domaine, liste d'IPs traitée)
+    """
+    if not POST_PROCESSORS:
+        yield from resolved
+        return
+    
+    # Transmettre explicitement les traitements : les processus fils (spawn) réimportent
+    # le module et ne voient pas les ajouts faits à l'exécution
+    worker = functools.partial(_post_process, processors=tuple(POST_PROCESSORS))
+    workers = os.cpu_count() or 1
+    resolved = iter(resolved)
+    # spawn plutôt que fork : les threads de résolution tournent encore pendant le
+    # démarrage du pool et peuvent détenir des verrous (stdout, logging, cache)
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        # Lots bornés : Executor.map consomme toute son entrée avant de rendre un résultat
+        while True:
+            batch = list(itertools.islice(resolved, POST_PROCESS_CHUNKSIZE * workers))
+            if not batch:
+                break
+            yield from executor.map(worker, batch, chunksize=POST_PROCESS_CHUNKSIZE)
 
 
 def read_domains_from_file(file_path: str) -> List[str]:
@@ -62,11 +467,7 @@ def read_domains_from_file(file_path: str) -> List[str]:
         List[str]: Liste des domaines
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read().strip()
-            # Séparer par les virgules et nettoyer les espaces
-            domains = [domain.strip() for domain in content.split(',') if domain.strip()]
-            return domains
+        return list(iter_domains(file_path))
     except FileNotFoundError:
         print(f"Erreur: Le fichier {file_path} n'existe pas.")
         sys.exit(1)
@@ -79,44 +480,53 @@ def save_results_to_json(results: Dict[str, List[str]], output_file: str):
     """
     Sauvegarde les résultats dans un fichier JSON
     
+    Le document est écrit entrée par entrée pour ne jamais le construire
+    entièrement en mémoire.
+    
     Args:
         results (Dict[str, List[str]]): Dictionnaire domaine -> liste d'IPs
         output_file (str): Chemin du fichier de sortie JSON
     """
     try:
-        with open(output_file, 'w', encoding='utf-8') as file:
-            json.dump(results, file, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+            if not results:
+                file.write(b'{}')
+            else:
+                file.write(b'{\n')
+                for i, (domain, ips) in enumerate(results.items()):
+                    if i:
+                        file.write(b',\n')
+                    # Entrée indentée seule, sans les accolades du dictionnaire
+                    file.write(_dumps({domain: ips})[2:-2])
+                file.write(b'\n}')
         print(f"Résultats sauvegardés dans {output_file}")
     except Exception as e:
         print(f"Erreur lors de la sauvegarde: {e}")
         sys.exit(1)
 
 
-def create_ip_list_for_git(results: Dict[str, List[str]]) -> List[str]:
+def _git(*args: str) -> subprocess.CompletedProcess:
     """
-    Crée une liste simple d'adresses IP pour le format Git
+    Exécute une commande Git sans fsmonitor ni gc automatique
     
     Args:
-        results (Dict[str, List[str]]): Dictionnaire domaine -> liste d'IPs
+        *args (str): Arguments de la commande Git
         
     Returns:
-        List[str]: Liste unique d'adresses IP
+        subprocess.CompletedProcess: Résultat de la commande
     """
-    ip_set = set()
-    for domain, ips in results.items():
-        for ip in ips:
-            ip_set.add(ip)
-    
-    # Trier les IPs pour un ordre cohérent
-    return sorted(list(ip_set))
+    return subprocess.run(
+        ['git', '-c', 'core.fsmonitor=false', '-c', 'gc.auto=0', *args],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
 
 
-def push_to_git(results: Dict[str, List[str]], domains_count: int, ips_count: int):
+def push_to_git(ip_list: List[str], domains_count: int, ips_count: int):
     """
     Pousse les fichiers JSON et TXT vers le repository Git
     
     Args:
-        results (Dict[str, List[str]]): Dictionnaire domaine -> liste d'IPs
+        ip_list (List[str]): Liste unique et triée d'adresses IP, construite pendant la résolution
         domains_count (int): Nombre de domaines traités
         ips_count (int): Nombre total d'IPs trouvées
     """
@@ -128,30 +538,29 @@ def push_to_git(results: Dict[str, List[str]], domains_count: int, ips_count: in
         
         print(f"\nPush vers Git...")
         
-        # Créer la liste d'IPs pour Git
-        ip_list = create_ip_list_for_git(results)
-        
         # Sauvegarder au format JSON pour Git
-        with open(git_filename_json, 'w', encoding='utf-8') as file:
-            json.dump(ip_list, file, indent=2, ensure_ascii=False)
+        payload = _dumps(ip_list)
+        with open(git_filename_json, 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+            file.write(payload)
         print(f"  → Fichier {git_filename_json} créé au format liste ({len(ip_list)} IPs uniques)")
         
         # Sauvegarder au format TXT pour Git (une IP par ligne)
-        with open(git_filename_txt, 'w', encoding='utf-8') as file:
-            for ip in ip_list:
-                file.write(f"{ip}\n")
+        # Les IPs sont en ASCII : encoder une fois et écrire en binaire
+        payload = "".join(f"{ip}\n" for ip in ip_list).encode('ascii')
+        with open(git_filename_txt, 'wb') as file:
+            file.write(payload)
         print(f"  → Fichier {git_filename_txt} créé au format texte ({len(ip_list)} IPs uniques)")
         
         # Ajouter les fichiers JSON et TXT
-        subprocess.run(['git', 'add', git_filename_json, git_filename_txt], check=True, capture_output=True)
+        _git('add', git_filename_json, git_filename_txt)
         print(f"  → Fichiers {git_filename_json} et {git_filename_txt} ajoutés")
         
         # Créer le commit
-        subprocess.run(['git', 'commit', '-m', commit_message], check=True, capture_output=True)
+        _git('commit', '-m', commit_message)
         print(f"  → Commit créé: {commit_message}")
         
         # Pousser vers origin
-        subprocess.run(['git', 'push', 'origin', 'master'], check=True, capture_output=True)
+        _git('push', 'origin', 'master')
         print(f"  → Push vers GitHub réussi")
         
     except subprocess.CalledProcessError as e:
@@ -161,6 +570,47 @@ def push_to_git(results: Dict[str, List[str]], domains_count: int, ips_count: in
         print(f"Erreur inattendue lors du push Git: {e}")
 
 
+def print_progress(index: int, total: int, domain: str, ips: List[str]):
+    """
+    Affiche le résultat de la résolution d'un domaine
+    
+    Args:
+        index (int): Position du domaine dans la progression
+        total (int): Nombre total de domaines
+        domain (str): Le domaine résolu
+        ips (List[str]): Liste des adresses IP trouvées
+    """
+    # Ne rien formater si la progression n'est pas affichée
+    if not log.isEnabledFor(logging.INFO):
+        return
+    log.info("[%d/%d] Résolution de %s...", index, total, domain)
+    if ips:
+        log.info("  → %d adresse(s) IP trouvée(s): %s", len(ips), ', '.join(ips))
+    else:
+        log.info("  → Aucune adresse IP trouvée")
+
+
+def _float_from_env(parser: argparse.ArgumentParser, name: str, default: float) -> float:
+    """
+    Lit une valeur numérique par défaut dans une variable d'environnement
+    
+    Args:
+        parser (argparse.ArgumentParser): Parser utilisé pour signaler une valeur invalide
+        name (str): Nom de la variable d'environnement
+        default (float): Valeur si la variable n'est pas définie
+        
+    Returns:
+        float: La valeur lue
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        parser.error(f"{name} doit être un nombre (reçu: {value!r})")
+
+
 def main():
     """Fonction principale"""
     parser = argparse.ArgumentParser(
@@ -180,9 +630,54 @@ def main():
         action='store_true',
         help="Ne pas pousser le résultat vers Git automatiquement"
     )
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help="Résolution asynchrone (asyncio + aiodns si disponible) pour les très grandes listes"
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        help=f"Délai maximal par domaine en secondes, uniquement avec --async "
+             f"(défaut: $RESOLVE_TIMEOUT ou {DEFAULT_TIMEOUT:g}). Sans aiodns, un domaine "
+             f"bloqué est abandonné mais retarde toujours la fin de l'exécution"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f"Ne pas utiliser le cache DNS persistant ({DEFAULT_CACHE_FILE})"
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        help=f"Durée de validité du cache DNS en secondes "
+             f"(défaut: $DNS_CACHE_TTL ou {DEFAULT_CACHE_TTL:g})"
+    )
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help="Ne pas afficher la progression domaine par domaine"
+    )
     
     args = parser.parse_args()
     
+    logging.basicConfig(
+        stream=sys.stdout,
+        format='%(message)s',
+        level=logging.WARNING if args.quiet else logging.INFO
+    )
+    
+    # getaddrinfo ne peut pas être interrompu : le délai ne s'applique qu'en mode --async
+    if args.timeout is not None and not args.use_async:
+        print("Attention: --timeout n'a d'effet qu'avec --async, il est ignoré")
+    if args.timeout is None:
+        args.timeout = _float_from_env(parser, 'RESOLVE_TIMEOUT', DEFAULT_TIMEOUT)
+    if not args.timeout > 0:
+        parser.error(f"le délai doit être strictement positif (reçu: {args.timeout:g})")
+    if args.cache_ttl is None:
+        args.cache_ttl = _float_from_env(parser, 'DNS_CACHE_TTL', DEFAULT_CACHE_TTL)
+    
     print(f"Lecture des domaines depuis {args.input_file}...")
     domains = read_domains_from_file(args.input_file)
     
@@ -190,26 +685,52 @@ def main():
         print("Aucun domaine trouvé dans le fichier.")
         sys.exit(1)
     
+    # Ignorer les doublons (même hôte une fois nettoyé), en gardant le premier
+    unique = {}
+    for domain in domains:
+        unique.setdefault(_clean(domain), domain)
+    duplicates = len(domains) - len(unique)
+    domains = list(unique.values())
+    if duplicates:
+        print(f"{duplicates} domaine(s) en double ignoré(s)")
+    
     print(f"Résolution des adresses IP pour {len(domains)} domaine(s)...")
     
-    results = {}
-    for i, domain in enumerate(domains, 1):
-        print(f"[{i}/{len(domains)}] Résolution de {domain}...")
-        ips = resolve_domain_ips(domain)
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = _Cache(DEFAULT_CACHE_FILE, args.cache_ttl)
+        except sqlite3.Error as e:
+            print(f"Cache DNS indisponible, résolution sans cache: {e}")
+    
+    # Pré-remplir dans l'ordre du fichier d'entrée, conservé dans le JSON de sortie
+    results = dict.fromkeys(domains)
+    if args.use_async:
+        # Une seule boucle d'événements, sans thread par requête
+        resolved = resolve_async(domains, args.timeout, cache)
+    else:
+        resolved = resolve_threaded(domains, cache)
+    resolved = post_process(resolved)
+    
+    # IPs uniques et compteurs tenus à jour au fil des résolutions
+    ip_set = set()
+    total_ips = 0
+    domains_with_ips = 0
+    for i, (domain, ips) in enumerate(resolved, 1):
         results[domain] = ips
-        
+        ip_set.update(ips)
+        total_ips += len(ips)
         if ips:
-            print(f"  → {len(ips)} adresse(s) IP trouvée(s): {', '.join(ips)}")
-        else:
-            print(f"  → Aucune adresse IP trouvée")
+            domains_with_ips += 1
+        print_progress(i, len(domains), domain, ips)
+    
+    if cache is not None:
+        cache.close()
     
     print(f"\nSauvegarde des résultats...")
     save_results_to_json(results, args.output)
     
     # Afficher un résumé
-    total_ips = sum(len(ips) for ips in results.values())
-    domains_with_ips = sum(1 for ips in results.values() if ips)
-    
     print(f"\n=== RÉSUMÉ ===")
     print(f"Domaines traités: {len(domains)}")
     print(f"Domaines résolus: {domains_with_ips}")
@@ -217,7 +738,8 @@ def main():
     
     # Push vers Git si demandé
     if not args.no_git:
-        push_to_git(results, len(domains), total_ips)
+        # Trier les IPs pour un ordre cohérent
+        push_to_git(sorted(ip_set), len(domains), total_ips)
     else:
         print(f"\nPush Git désactivé (--no-git)")
 